@@ -1,5 +1,7 @@
 import logging
 
+from baddns.lib.signatureindex import SignatureIndex
+
 log = logging.getLogger(__name__)
 
 
@@ -8,6 +10,7 @@ class BadDNS_base:
         self,
         target,
         http_client_class=None,
+        http_client=None,
         dns_client=None,
         signatures=None,
         custom_nameservers=None,
@@ -16,12 +19,17 @@ class BadDNS_base:
     ):
         self.target = self.set_target(target)
         self.http_client_class = http_client_class
+        self.http_client = http_client
         self.dns_client = dns_client
         self.signatures = signatures
         self.custom_nameservers = custom_nameservers
         self.parent_class = kwargs.get("parent_class", "self")
         self.cli = cli
 
+    @property
+    def signature_index(self):
+        return SignatureIndex.get(self.signatures)
+
     # hook to allow external manipulation of target assignment
     def set_target(self, target):
         return target
@@ -13,6 +13,7 @@ from pathlib import Path
 from .lib.errors import BadDNSSignatureException, BadDNSCLIException
 from .lib.logging import setup_logging
 from .lib.loader import load_signatures
+from .lib.httpmanager import HttpManager
 
 from baddns.base import get_all_modules
 
@@ -75,11 +76,18 @@ def validate_modules(arg_value, pattern=re.compile(r"^[a-zA-Z0-9_]+(,[a-zA-Z0-9_
     return arg_value
 
 
-async def execute_module(ModuleClass, target, custom_nameservers, signatures, silent=False, direct_mode=False):
+async def execute_module(
+    ModuleClass, target, custom_nameservers, signatures, silent=False, direct_mode=False, http_client=None
+):
     findings = None
     try:
         module_instance = ModuleClass(
-            target, custom_nameservers=custom_nameservers, signatures=signatures, cli=True, direct_mode=direct_mode
+            target,
+            custom_nameservers=custom_nameservers,
+            signatures=signatures,
+            cli=True,
+            direct_mode=direct_mode,
+            http_client=http_client,
         )
     except BadDNSSignatureException as e:
         log.error(f"Error loading signatures: {e}")
@@ -205,11 +213,23 @@ async def _main():
             target_list = [line.strip() for line in f.readlines()]
     else:
         target_list = args.target
-    for cur_target in target_list:
-        for ModuleClass in modules_to_execute:
-            await execute_module(
-                ModuleClass, cur_target, custom_nameservers, signatures, silent=silent, direct_mode=direct_mode
-            )
+
+    # share one HTTP client (and its connection pool) across every module and target
+    http_client = HttpManager.create_http_client()
+    try:
+        for cur_target in target_list:
+            for ModuleClass in modules_to_execute:
+                await execute_module(
+                    ModuleClass,
+                    cur_target,
+                    custom_nameservers,
+                    signatures,
+                    silent=silent,
+                    direct_mode=direct_mode,
+                    http_client=http_client,
+                )
+    finally:
+        await http_client.aclose()
 
 
 def main():
@@ -0,0 +1,38 @@
+import time
+import logging
+
+log = logging.getLogger(__name__)
+
+
+class TTLCache:
+    """
+    Minimal process-local cache with a fixed time-to-live per entry and a size cap. Once full, the oldest entry is
+    evicted to make room for a new one.
+    """
+
+    def __init__(self, ttl, maxsize):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data = {}
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key, default=None):
+        entry = self._data.get(key)
+        if entry is None:
+            return default
+        expires, value = entry
+        if expires < time.monotonic():
+            self._data.pop(key, None)
+            return default
+        return value
+
+    def set(self, key, value):
+        self._data.pop(key, None)
+        if len(self._data) >= self.maxsize:
+            self._data.pop(next(iter(self._data)))
+        self._data[key] = (time.monotonic() + self.ttl, value)
+
+    def clear(self):
+        self._data.clear()
@@ -1,11 +1,64 @@
 import re
+import weakref
 import logging
 import asyncio
 import dns.asyncresolver
 
+from .cache import TTLCache
+
 log = logging.getLogger(__name__)
 
 
+class _GlobalResolver:
+    """
+    Process-wide resolver state shared by every DNSManager.
+
+    Building a resolver re-reads the system resolver configuration, so one is kept per set of nameservers instead of
+    one per DNSManager. Every query also goes through a semaphore (one per event loop), which keeps large scans from
+    exhausting file descriptors or flooding the upstream resolvers.
+    """
+
+    max_concurrent_queries = 512
+    # per-attempt timeout and overall per-query budget, so a dead nameserver can't stall a scan
+    timeout = 2.0
+    lifetime = 4.0
+
+    # answers (and NXDOMAIN/NoAnswer results) for the shared resolvers, keyed on (target, rdatatype)
+    cache_ttl = 300
+    cache_maxsize = 200000
+
+    _resolvers = {}
+    _caches = {}
+    _semaphores = weakref.WeakKeyDictionary()
+
+    @classmethod
+    def get(cls, nameservers=None):
+        key = tuple(nameservers) if nameservers else None
+        resolver = cls._resolvers.get(key)
+        if resolver is None:
+            resolver = dns.asyncresolver.Resolver()
+            if nameservers:
+                resolver.nameservers = list(nameservers)
+            resolver.timeout = cls.timeout
+            resolver.lifetime = cls.lifetime
+            cls._resolvers[key] = resolver
+            cls._caches[key] = TTLCache(ttl=cls.cache_ttl, maxsize=cls.cache_maxsize)
+        return resolver
+
+    @classmethod
+    def cache(cls, nameservers=None):
+        return cls._caches.get(tuple(nameservers) if nameservers else None)
+
+    @classmethod
+    def semaphore(cls):
+        loop = asyncio.get_running_loop()
+        semaphore = cls._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(cls.max_concurrent_queries)
+            cls._semaphores[loop] = semaphore
+        return semaphore
+
+
 class DNSManager:
     dns_record_types = ["A", "AAAA", "MX", "CNAME", "NS", "SOA", "TXT", "NSEC"]
 
@@ -13,13 +66,15 @@ class DNSManager:
     dns_name_regex = re.compile(_dns_name_regex, re.I)
 
     def __init__(self, target, dns_client=None, custom_nameservers=None):
+        # only answers from the shared resolvers are cached, a caller-supplied client owns its own caching
+        self.dns_cache = None
         if not dns_client:
-            self.dns_client = dns.asyncresolver.Resolver()
+            self.dns_client = _GlobalResolver.get(custom_nameservers)
+            self.dns_cache = _GlobalResolver.cache(custom_nameservers)
         else:
             self.dns_client = dns_client
-
-        if custom_nameservers:
-            self.dns_client.nameservers = custom_nameservers
+            if custom_nameservers:
+                self.dns_client.nameservers = custom_nameservers
 
         self.tld_nameservers = None
 
@@ -29,7 +84,8 @@ class DNSManager:
 
     def reset_answers(self):
         self.answers = {key: None for key in self.dns_record_types}
-        self.answers.update({"NoAnswer": False, "NXDOMAIN": False})
+        # the CNAME chain is always a tuple (empty when there is none), so callers can just test its truthiness
+        self.answers.update({"CNAME": (), "NoAnswer": False, "NXDOMAIN": False})
 
     @staticmethod
     def get_ipv4(a_records):
@@ -84,9 +140,31 @@ class DNSManager:
                 log.debug(f'Unknown DNS record type "{rdtype}"')
         return list(results)
 
+    async def resolve(self, target, rdatatype):
+        if self.dns_cache is None:
+            async with _GlobalResolver.semaphore():
+                return await self.dns_client.resolve(target, rdatatype)
+
+        cache_key = (str(target).lower(), rdatatype)
+        cached = self.dns_cache.get(cache_key)
+        if cached is not None:
+            if isinstance(cached, Exception):
+                raise cached.with_traceback(None)
+            return cached
+
+        try:
+            async with _GlobalResolver.semaphore():
+                answer = await self.dns_client.resolve(target, rdatatype)
+        except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer) as e:
+            # negative answers are cached too, timeouts and server failures are not
+            self.dns_cache.set(cache_key, e)
+            raise
+        self.dns_cache.set(cache_key, answer)
+        return answer
+
     async def do_resolve(self, target, rdatatype):
         try:
-            r = self.process_answer(await self.dns_client.resolve(target, rdatatype), rdatatype)
+            r = self.process_answer(await self.resolve(target, rdatatype), rdatatype)
         except (dns.resolver.NoAnswer, dns.resolver.NoNameservers) as e:
             log.debug(f"encountered error with dns_client.resolve(): {e}")
             self.answers["NoAnswer"] = True
@@ -118,30 +196,34 @@ class DNSManager:
                     target = result_cname
 
                     try:
-                        r = self.process_answer(await self.dns_client.resolve(target, "CNAME"), "CNAME")
+                        r = self.process_answer(await self.resolve(target, "CNAME"), "CNAME")
                         if len(r) == 0:
                             break
                     except (dns.resolver.NoAnswer, dns.resolver.NXDOMAIN, dns.resolver.NoNameservers) as e:
                         log.debug(f"Error resolving cname chain: {e}")
                         break
-                return cname_chain
+                return tuple(cname_chain)
             return r
 
-    async def dispatchDNS(self, omit_types=[]):
+    async def dispatchDNS(self, omit_types=()):
         log.debug(f"attempting to resolve {self.target}")
         log.debug(f"dispatching DNS with the following nameservers: {' '.join(self.dns_client.nameservers)}")
 
-        tasks = []
-        for rdatatype in self.dns_record_types:
-            if rdatatype in omit_types:
-                continue
-            # Capture the current rdatatype for each task
-            task = asyncio.create_task(self.do_resolve(self.target, rdatatype))
-            tasks.append((task, rdatatype))  # Store the task along with its rdatatype
-
-        for task, rdatatype in tasks:  # Unpack the task and its corresponding rdatatype
-            try:
-                self.answers[rdatatype] = await task
-            except dns.resolver.LifetimeTimeout:
+        # a set of plain record type strings. A nested list (or other unhashable entry) fails loudly here instead of
+        # silently omitting nothing
+        omit_types = set(omit_types)
+        rdatatypes = [rdatatype for rdatatype in self.dns_record_types if rdatatype not in omit_types]
+        # all record types are resolved concurrently, so a dispatch takes as long as its slowest query
+        results = await asyncio.gather(
+            *[self.do_resolve(self.target, rdatatype) for rdatatype in rdatatypes], return_exceptions=True
+        )
+
+        for rdatatype, result in zip(rdatatypes, results):
+            if isinstance(result, dns.resolver.LifetimeTimeout):
                 log.debug(f"Got LifetimeTimeout for rdatatype [{rdatatype}] for target [{self.target}]")
-                self.answers[rdatatype] = None
+                result = None
+            elif isinstance(result, BaseException):
+                raise result
+            if rdatatype == "CNAME" and result is None:
+                result = ()
+            self.answers[rdatatype] = result
@@ -38,12 +38,12 @@ class Finding:
         trigger = finding_dict.get("trigger", None)
         if not indicator:
             raise BadDNSFindingException("trigger is required in a Finding")
-        if isinstance(trigger, list):
+        if isinstance(trigger, (list, tuple)):
             trigger = ", ".join(trigger)
         elif isinstance(trigger, str):
             pass
         else:
-            raise BadDNSFindingException("trigger must be either str or list")
+            raise BadDNSFindingException("trigger must be either str, list or tuple")
         self.finding_dict["trigger"] = trigger
 
         module = finding_dict.get("module", None)
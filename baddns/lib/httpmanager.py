@@ -1,30 +1,22 @@
 import httpx
 import logging
 import asyncio
+from http.cookiejar import CookieJar, DefaultCookiePolicy
 
 log = logging.getLogger(__name__)
 
 
-async def as_completed(coros):
-    tasks = {coro if isinstance(coro, asyncio.Task) else asyncio.create_task(coro): coro for coro in coros}
-    while tasks:
-        done, _ = await asyncio.wait(tasks.keys(), return_when=asyncio.FIRST_COMPLETED)
-        for task in done:
-            tasks.pop(task)
-            yield task
-
-
 class HttpManager:
-    def __init__(self, target, http_client_class=None, skip_redirects=False):
+    def __init__(self, target, http_client_class=None, skip_redirects=False, http_client=None):
         self.skip_redirects = skip_redirects
-        if not http_client_class:
-            http_client_class = httpx.AsyncClient
 
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:117.0) Gecko/20100101 Firefox/117.0",
-        }
-
-        self.http_client = http_client_class(timeout=5, verify=False, headers=headers)
+        # a client passed in is shared with other managers (and its connection pool with it), so we don't close it
+        if http_client:
+            self.http_client = http_client
+            self.owns_http_client = False
+        else:
+            self.http_client = self.create_http_client(http_client_class)
+            self.owns_http_client = True
         self.target = target
         for attr in [
             "http_allowredirects_results",
@@ -34,35 +26,53 @@ class HttpManager:
         ]:
             setattr(self, attr, None)
 
-    async def dispatchHttp(self):
-        protocols = ["http", "https"]
-        tasks = {}
+    @staticmethod
+    def create_http_client(http_client_class=None):
+        if not http_client_class:
+            http_client_class = httpx.AsyncClient
 
-        # Create tasks for both protocols (http and https) and both follow_redirects options
-        for protocol in protocols:
-            base_url = f"{protocol}://{self.target}/"
-            log.debug(f"Ready to make request to URL: {base_url}")
+        headers = {
+            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:117.0) Gecko/20100101 Firefox/117.0",
+        }
 
-            follow_redirects_options = [True, False] if not self.skip_redirects else [False]
-            for follow_redirects in follow_redirects_options:
-                task = asyncio.create_task(self.http_client.get(base_url, follow_redirects=follow_redirects))
-                tasks[task] = (protocol, follow_redirects, base_url)
+        # clients are shared across targets and modules, so never keep cookies: a cookie set by one target would
+        # otherwise be sent to its sibling subdomains, and matchers should see what a fresh visitor sees
+        cookies = CookieJar(policy=DefaultCookiePolicy(allowed_domains=[]))
+        return http_client_class(timeout=5, verify=False, headers=headers, cookies=cookies)
 
-        # Use as_completed to handle each task as it completes
-        async for completed_task in as_completed(tasks):
-            protocol, follow_redirects, base_url = tasks[completed_task]
+    async def _get(self, url, follow_redirects):
+        try:
+            return await self.http_client.get(url, follow_redirects=follow_redirects)
+        except Exception as e:
+            log.debug(f"Error occurred while fetching {url} (follow_redirects={follow_redirects}): {e}")
+            return None
 
-            attr_suffix = "allowredirects_results" if follow_redirects else "denyredirects_results"
-            attr_name = f"{protocol}_{attr_suffix}"
+    async def _dispatch_protocol(self, protocol):
+        base_url = f"{protocol}://{self.target}/"
+        log.debug(f"Ready to make request to URL: {base_url}")
 
-            try:
-                response = await completed_task
-                setattr(self, attr_name, response)
-            except Exception as e:
-                log.debug(f"Error occurred while fetching {base_url} (follow_redirects={follow_redirects}): {e}")
-                setattr(self, attr_name, None)
+        if self.skip_redirects:
+            setattr(self, f"{protocol}_denyredirects_results", await self._get(base_url, follow_redirects=False))
+            return
+
+        # A single request covers both variants over one connection: the first hop of the redirect chain is exactly
+        # what a client that doesn't follow redirects would have received.
+        allow_response = await self._get(base_url, follow_redirects=True)
+        if allow_response is not None:
+            deny_response = allow_response.history[0] if allow_response.history else allow_response
+        else:
+            # following the redirects failed (redirect loop, dead redirect target), but the first hop may still answer
+            deny_response = await self._get(base_url, follow_redirects=False)
+
+        setattr(self, f"{protocol}_allowredirects_results", allow_response)
+        setattr(self, f"{protocol}_denyredirects_results", deny_response)
+
+    async def dispatchHttp(self):
+        await asyncio.gather(*[self._dispatch_protocol(protocol) for protocol in ["http", "https"]])
 
     async def close(self):
-        """Clean up the http_client when done."""
+        """Clean up the http_client when done, unless it is shared."""
+        if not self.owns_http_client:
+            return
         await self.http_client.aclose()
         log.debug("HTTP client closed successfully.")
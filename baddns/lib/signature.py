@@ -1,3 +1,4 @@
+import json
 import logging
 
 from .errors import BadDNSSignatureException
@@ -17,6 +18,9 @@ class BadDNSSignature:
             "mode": None,
             "matcher_rule": {},
         }
+        self.cnames = ()
+        self.ips = frozenset()
+        self.matcher_rule_key = None
 
     def initialize(self, **kwargs):
         self.signature["mode"] = kwargs.get("mode", None)
@@ -57,6 +61,18 @@ class BadDNSSignature:
             if len(self.signature["identifiers"]["nameservers"]) == 0:
                 raise BadDNSSignatureException(f"In dns_nosoa mode, nameservers are required")
 
+        # flattened copies of the identifiers, so matching doesn't have to rebuild them for every target
+        self.cnames = tuple(c["value"] for c in self.signature["identifiers"]["cnames"])
+        self.ips = frozenset(self.signature["identifiers"]["ips"])
+        # canonical form of the matcher rule, so signatures with identical rules can share one evaluation
+        if self.signature["matcher_rule"]:
+            try:
+                self.matcher_rule_key = json.dumps(self.signature["matcher_rule"], sort_keys=True)
+            except (TypeError, ValueError):
+                # YAML can load values JSON can't represent (unquoted dates, for example). Such a rule is just never
+                # shared with another signature.
+                self.matcher_rule_key = id(self)
+
     def output(self):
         return self.signature
 
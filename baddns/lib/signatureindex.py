@@ -0,0 +1,168 @@
+import re
+import logging
+
+log = logging.getLogger(__name__)
+
+
+def _alternation(patterns):
+    """
+    Compiles a single regex matching any of the given literal patterns, or returns None if there are none.
+
+    The alternation is built from a prefix trie, so the regex engine walks shared prefixes once per position instead
+    of retrying every pattern in turn.
+    """
+    trie = {}
+    for pattern in set(patterns):
+        node = trie
+        for char in pattern:
+            node = node.setdefault(char, {})
+        node[""] = {}
+    if not trie:
+        return None
+    return re.compile(_trie_pattern(trie))
+
+
+def _trie_pattern(node):
+    branches = [re.escape(char) + _trie_pattern(child) for char, child in sorted(node.items()) if char]
+    if not branches:
+        return ""
+    if "" in node:
+        # a pattern ends here, so anything longer is optional
+        return f"(?:{'|'.join(branches)})?"
+    if len(branches) == 1:
+        return branches[0]
+    return f"(?:{'|'.join(branches)})"
+
+
+class SubstringIndex:
+    """
+    Hash index over a fixed set of string patterns.
+
+    Suffix lookups slice the subject once per distinct pattern length, so the cost depends on the size of the subject
+    rather than on the number of patterns.
+    """
+
+    def __init__(self, entries):
+        self.patterns = {}
+        for pattern, value in entries:
+            self.patterns.setdefault(pattern, []).append(value)
+        self.lengths = sorted({len(pattern) for pattern in self.patterns})
+
+    def get(self, pattern):
+        return self.patterns.get(pattern, [])
+
+    def match_suffixes(self, subject):
+        matched = []
+        subject_length = len(subject)
+        for length in self.lengths:
+            if length > subject_length:
+                break
+            suffix = subject[subject_length - length :]
+            if suffix in self.patterns:
+                matched.append(suffix)
+        return matched
+
+
+class SignatureIndex:
+    """
+    Lookup structures derived from a list of loaded signatures.
+
+    Building an index walks every signature once, so indexes are cached per signature list and shared between all
+    module instances that were handed the same list. Signature lists are treated as immutable once loaded.
+    """
+
+    _cache = {}
+    _cache_max_size = 16
+
+    def __init__(self, signatures):
+        self.signatures = signatures
+
+        nxdomain_entries = []
+        # dns_nosoa signatures in order, with their nameserver identifiers flattened
+        self.nosoa_sigs = []
+        # http signatures in order, and separately those without cname identifiers, which apply to every subject
+        self.http_sigs = []
+        self.http_unfiltered = []
+        for sig_position, sig in enumerate(signatures):
+            mode = sig.signature["mode"]
+            if mode == "dns_nxdomain":
+                for cname_position, sig_cname in enumerate(sig.cnames):
+                    nxdomain_entries.append((sig_cname, (sig_position, cname_position, sig)))
+            elif mode == "http":
+                self.http_sigs.append(sig)
+                if not sig.cnames:
+                    self.http_unfiltered.append(sig)
+            elif mode == "dns_nosoa":
+                self.nosoa_sigs.append((sig, tuple(sig.signature["identifiers"]["nameservers"])))
+
+        self.nxdomain_cnames = SubstringIndex(nxdomain_entries)
+        self.nxdomain_suffixes = tuple(self.nxdomain_cnames.patterns)
+        # one compiled alternation over every nosoa nameserver identifier rejects a non-matching nameserver in a
+        # single search. It only reports one pattern per position, so hits still need the ordered scan.
+        self.nosoa_regex = _alternation(s for _, sig_nameservers in self.nosoa_sigs for s in sig_nameservers)
+        self.http_regex = _alternation(c for sig in self.http_sigs for c in sig.cnames)
+
+    @classmethod
+    def get(cls, signatures):
+        # the cache entry holds a reference to the list, so its id can't be recycled while the entry is alive
+        cached = cls._cache.get(id(signatures))
+        if cached and cached.signatures is signatures and len(cached.signatures) == len(signatures):
+            return cached
+        log.debug(f"Building signature index for [{len(signatures)}] signatures")
+        index = cls(signatures)
+        if len(cls._cache) >= cls._cache_max_size:
+            cls._cache.pop(next(iter(cls._cache)))
+        cls._cache[id(signatures)] = index
+        return index
+
+    def nxdomain_matches(self, target):
+        """
+        Returns (signature, matching cname) pairs for every dns_nxdomain signature with a cname identifier that the
+        target ends with, in signature order. Only the first matching cname of each signature is returned.
+        """
+        # most targets match nothing, and str.endswith with a tuple rejects those in a single call
+        if not target.endswith(self.nxdomain_suffixes):
+            return []
+        best = {}
+        for suffix in self.nxdomain_cnames.match_suffixes(target):
+            for sig_position, cname_position, sig in self.nxdomain_cnames.get(suffix):
+                if sig_position not in best or cname_position < best[sig_position][0]:
+                    best[sig_position] = (cname_position, sig, suffix)
+        return [(sig, suffix) for _, (_, sig, suffix) in sorted(best.items())]
+
+    def http_candidates(self, subject):
+        """
+        Returns the http signatures that can apply to the subject, in signature order: those without cname
+        identifiers, and those with at least one cname identifier contained in the subject.
+        """
+        # a subject the alternation doesn't match contains none of the cname identifiers
+        if self.http_regex is None or not self.http_regex.search(subject):
+            return list(self.http_unfiltered)
+        candidates = []
+        for sig in self.http_sigs:
+            if sig.cnames:
+                for sig_cname in sig.cnames:
+                    if sig_cname in subject:
+                        candidates.append(sig)
+                        break
+            else:
+                candidates.append(sig)
+        return candidates
+
+    def nosoa_match(self, nameservers):
+        """
+        Returns the first dns_nosoa signature (in signature order) with a nameserver identifier contained in any of
+        the given nameservers, or None.
+        """
+        if self.nosoa_regex is None:
+            return None
+        # nameservers the alternation doesn't match can't contain any identifier, so only the rest are rescanned
+        nameservers = [ns for ns in nameservers if self.nosoa_regex.search(ns)]
+        if not nameservers:
+            return None
+        for sig, sig_nameservers in self.nosoa_sigs:
+            for ns in nameservers:
+                for s in sig_nameservers:
+                    if s in ns:
+                        return sig
+        return None
@@ -1,12 +1,30 @@
 import whois
 import logging
+import functools
 import asyncio
 import tldextract
-from datetime import datetime, timezone, timedelta, date
+from datetime import datetime, timezone, date
 from dateutil import parser as date_parser
 
+from .cache import TTLCache
+
 log = logging.getLogger(__name__)
 
+# WHOIS servers rate-limit aggressively, and many CNAMEs in a scan share a registered domain
+_WHOIS_CACHE = TTLCache(ttl=6 * 60 * 60, maxsize=10000)
+
+# the handful of unambiguous formats WHOIS servers actually use, tried before falling back to dateutil
+_WHOIS_DATE_FORMATS = (
+    "%Y-%m-%dT%H:%M:%S%z",
+    "%Y-%m-%dT%H:%M:%S.%f%z",
+    "%Y-%m-%dT%H:%M:%S",
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%d",
+    "%d-%b-%Y",
+    "%Y.%m.%d",
+    "%Y/%m/%d",
+)
+
 
 class WhoisManager:
     def __init__(self, target):
@@ -20,20 +38,51 @@ class WhoisManager:
         else:
             registered_domain = ext.registered_domain
         log.debug(f"Extracted base domain [{registered_domain}] from [{self.target}]")
+        cached = _WHOIS_CACHE.get(registered_domain)
+        if cached:
+            log.debug(f"Using cached WHOIS result for {registered_domain}")
+            self.whois_result = cached
+            return
+
         log.debug(f"Submitting WHOIS query for {registered_domain}")
         try:
             w = await asyncio.to_thread(whois.whois, registered_domain, quiet=True)
             log.debug(f"Got response to whois request for {registered_domain}")
-            self.whois_result = {"type": "response", "data": w}
+            self.whois_result = self._postprocess({"type": "response", "data": w})
         except whois.parser.PywhoisError as e:
             log.debug(f"Got PywhoisError for whois request for {registered_domain}")
             self.whois_result = {"type": "error", "data": str(e)}
         except Exception as e:
+            # don't cache these, they are usually transient (timeouts, rate limiting)
             log.debug(f"Got unknown error from whois: {str(e)}")
             self.whois_result = {"type": "error", "data": str(e)}
+            return
+        _WHOIS_CACHE.set(registered_domain, self.whois_result)
+
+    @classmethod
+    def _postprocess(cls, whois_result):
+        # normalize the expiration date once, when the result is stored (and cached), instead of on every analysis
+        data = whois_result["data"]
+        if data is not None:
+            data["expiration_date"] = cls.normalize_expiration(data.get("expiration_date", None))
+        return whois_result
+
+    @classmethod
+    def normalize_expiration(cls, expiration_data):
+        if isinstance(expiration_data, list):
+            log.debug(f"Got multiple expiration dates {expiration_data}. Falling back to the latest...")
+            parsed_dates = [cls.date_parse(d) for d in expiration_data]
+            normalized_dates = [cls.normalize_date(d) for d in parsed_dates if d]
+            return max(normalized_dates) if normalized_dates else None
+
+        expiration_date = cls.date_parse(expiration_data)
+        if expiration_date:
+            return cls.normalize_date(expiration_date)
+        return None
 
     def analyzeWHOIS(self):
         if self.whois_result:
+            today_ordinal = date.today().toordinal()
             whois_findings = []
             if self.whois_result["type"] == "error":
                 log.debug("whois result was an error")
@@ -42,29 +91,18 @@ class WhoisManager:
 
             elif self.whois_result["type"] == "response":
                 log.debug("whois resulted in a response")
-                expiration_data = self.whois_result.get("data", {}).get("expiration_date", None)
-
-                if isinstance(expiration_data, list):
-                    log.debug("Expiration data:")
-                    log.debug(expiration_data)
-                    log.debug("Got multiple expiration dates. Falling back to the latest...")
-
-                    normalized_dates = [
-                        self.normalize_date(self.date_parse(date)) for date in expiration_data if self.date_parse(date)
-                    ]
-                    expiration_date = max(normalized_dates) if normalized_dates else None
-
-                else:
-                    expiration_date = self.date_parse(expiration_data)
-                    if expiration_date:
-                        expiration_date = self.normalize_date(expiration_date)
+                # already a UTC datetime when the result came from dispatchWHOIS, this only does work for raw data
+                expiration_date = self.normalize_expiration(
+                    self.whois_result.get("data", {}).get("expiration_date", None)
+                )
 
                 if expiration_date:
-                    current_date = date.today()
-                    expiration_plus_one = expiration_date.date() + timedelta(days=1)
-                    if expiration_plus_one < current_date:
+                    # day-granularity comparison on plain ints, with one day of grace after the expiration date
+                    if expiration_date.toordinal() + 1 < today_ordinal:
                         log.debug(
-                            f"Current Date (minus one) ({current_date.strftime('%Y-%m-%d')}) is after Expiration Date ({expiration_date.date().strftime('%Y-%m-%d')})"
+                            "Current Date (minus one) (%s) is after Expiration Date (%s)",
+                            date.fromordinal(today_ordinal),
+                            expiration_date.date(),
                         )
                         whois_findings.append(
                             f"Registration Expired (Expiration: [{expiration_date.strftime('%Y-%m-%d %H:%M:%S')}]"
@@ -83,15 +121,27 @@ class WhoisManager:
 
         # If it's a string, try to parse it
         if isinstance(unknown_date, str):
-            try:
-                return date_parser.parse(unknown_date)
-            except ValueError as e:
-                log.debug(f"Failed to parse date from string: {unknown_date}. Error: {e}")
-                return None
+            return WhoisManager._parse_date_string(unknown_date)
 
         log.debug(f"Unsupported date object type: {type(unknown_date)}. Value: {unknown_date}")
         return None
 
+    # the same expiration strings show up over and over across a scan
+    @staticmethod
+    @functools.lru_cache(maxsize=10000)
+    def _parse_date_string(date_string):
+        stripped_date = date_string.strip()
+        for date_format in _WHOIS_DATE_FORMATS:
+            try:
+                return datetime.strptime(stripped_date, date_format)
+            except ValueError:
+                continue
+        try:
+            return date_parser.parse(date_string)
+        except ValueError as e:
+            log.debug(f"Failed to parse date from string: {date_string}. Error: {e}")
+            return None
+
     @staticmethod
     def normalize_date(date):
         if date.tzinfo is None:
@@ -1,3 +1,4 @@
+import asyncio
 import tldextract
 
 from baddns.base import BadDNS_base
@@ -27,15 +28,26 @@ class BadDNS_cname(BadDNS_base):
         self.target_httpmanager = None
         self.cname_dnsmanager = None
         self.cname_whoismanager = None
+        self.http_candidates = []
+
+    def _http_sig_candidates(self, subject, ips):
+        ip_set = frozenset(ips)
+        candidates = []
+        # only signatures whose cname identifiers (if any) appear in the subject are candidates
+        for sig in self.signature_index.http_candidates(subject):
+            if sig.ips and sig.ips.isdisjoint(ip_set):
+                log.debug("no match for %s for in %s", sig.signature["identifiers"]["ips"], ip_set)
+                continue
+            candidates.append(sig)
+        return candidates
 
     async def dispatch(self):
         await self.target_dnsmanager.dispatchDNS()
         if self.direct_mode == False:
-            if self.target_dnsmanager.answers["CNAME"] != None:
-                self.infomsg(
-                    f"Found CNAME(S) [{' -> '.join([self.target_dnsmanager.target] + self.target_dnsmanager.answers['CNAME'])}]"
-                )
-                self.subject = self.target_dnsmanager.answers["CNAME"][-1]
+            cnames = self.target_dnsmanager.answers["CNAME"]
+            if cnames:
+                self.infomsg(f"Found CNAME(S) [{' -> '.join((self.target_dnsmanager.target,) + cnames)}]")
+                self.subject = cnames[-1]
             else:
                 if self.parent_class == "self":
                     self.infomsg("No CNAME Found :/")
@@ -46,19 +58,27 @@ class BadDNS_cname(BadDNS_base):
         self.cname_dnsmanager = DNSManager(self.subject, dns_client=self.dns_client)
         await self.cname_dnsmanager.dispatchDNS(omit_types=["CNAME", "NSEC"])
 
-        # if the domain resolves, we can try for HTTP connections
-        if not self.cname_dnsmanager.answers["NXDOMAIN"]:
-            log.debug("CNAME resolved correctly, proceeding with HTTP dispatch")
-            self.target_httpmanager = HttpManager(self.target, http_client_class=self.http_client_class)
-            await self.target_httpmanager.dispatchHttp()
-            log.debug("HTTP dispatch complete")
         # if the cname doesn't resolve, we still need to see if the base domain is unregistered
         # even if it is registered, we still use whois to check for expired domains
-        log.debug("performing WHOIS lookup")
-
         self.cname_whoismanager = WhoisManager(self.subject)
-        await self.cname_whoismanager.dispatchWHOIS()
-        log.debug("WHOIS dispatch complete")
+        dispatch_tasks = [self.cname_whoismanager.dispatchWHOIS()]
+
+        # if the domain resolves, we can try for HTTP connections, as long as some http signature could apply
+        if not self.cname_dnsmanager.answers["NXDOMAIN"]:
+            self.http_candidates = self._http_sig_candidates(self.subject, self.cname_dnsmanager.ips)
+            if self.http_candidates:
+                log.debug("CNAME resolved correctly, proceeding with HTTP dispatch")
+                self.target_httpmanager = HttpManager(
+                    self.target, http_client_class=self.http_client_class, http_client=self.http_client
+                )
+                dispatch_tasks.append(self.target_httpmanager.dispatchHttp())
+            else:
+                log.debug("CNAME resolved correctly, but no HTTP signatures apply to it. Skipping HTTP dispatch")
+
+        # HTTP and WHOIS don't depend on each other, so run them concurrently
+        log.debug("performing WHOIS lookup")
+        await asyncio.gather(*dispatch_tasks)
+        log.debug("HTTP/WHOIS dispatch complete")
         return True
 
     def analyze(self):
@@ -67,39 +87,34 @@ class BadDNS_cname(BadDNS_base):
             trigger = ["self"]
         else:
             trigger = self.target_dnsmanager.answers["CNAME"]
+        last_cname = trigger[-1]
+        cname_target = self.cname_dnsmanager.target
         if self.cname_dnsmanager.answers["NXDOMAIN"]:
             signature_match = False
             indicator = None
 
-            self.infomsg(f"Got NXDOMAIN for CNAME {self.cname_dnsmanager.target}. Checking against signatures...")
-            for sig in self.signatures:
-                if sig.signature["mode"] == "dns_nxdomain":
-                    log.debug(f"Trying signature {sig.signature['service_name']}")
-                    sig_cnames = [c["value"] for c in sig.signature["identifiers"]["cnames"]]
-                    for sig_cname in sig_cnames:
-                        log.debug(f"Checking CNAME {self.cname_dnsmanager.target} against {sig_cname}")
-                        if self.cname_dnsmanager.target.endswith(sig_cname):
-                            signature_match = True
-                            log.debug(f"CNAME {self.cname_dnsmanager.target} vulnerable ({sig_cname})")
-                            indicator = sig_cname
-                            findings.append(
-                                Finding(
-                                    {
-                                        "target": self.target_dnsmanager.target,
-                                        "description": f"Dangling CNAME, probable subdomain takeover (NXDOMAIN technique)",
-                                        "confidence": "PROBABLE",
-                                        "signature": sig.signature["service_name"],
-                                        "indicator": indicator,
-                                        "trigger": trigger,
-                                        "module": type(self),
-                                    }
-                                )
-                            )
-                            break
+            self.infomsg(f"Got NXDOMAIN for CNAME {cname_target}. Checking against signatures...")
+            for sig, sig_cname in self.signature_index.nxdomain_matches(cname_target):
+                signature_match = True
+                log.debug("CNAME %s vulnerable (%s)", cname_target, sig_cname)
+                indicator = sig_cname
+                findings.append(
+                    Finding(
+                        {
+                            "target": self.target_dnsmanager.target,
+                            "description": f"Dangling CNAME, probable subdomain takeover (NXDOMAIN technique)",
+                            "confidence": "PROBABLE",
+                            "signature": sig.signature["service_name"],
+                            "indicator": indicator,
+                            "trigger": trigger,
+                            "module": type(self),
+                        }
+                    )
+                )
             if (
                 signature_match == False
-                and trigger[-1] != "self"
-                and tldextract.extract(trigger[-1]).registered_domain
+                and last_cname != "self"
+                and tldextract.extract(last_cname).registered_domain
                 != tldextract.extract(self.target_dnsmanager.target).registered_domain
             ):
                 findings.append(
@@ -117,10 +132,12 @@ class BadDNS_cname(BadDNS_base):
                 )
             else:
                 log.debug(
-                    f"Not reporting generic cname for trigger [{trigger}] from domain [{self.target_dnsmanager.target}]"
+                    "Not reporting generic cname for trigger [%s] from domain [%s]",
+                    trigger,
+                    self.target_dnsmanager.target,
                 )
 
-        else:
+        elif self.target_httpmanager:
             log.debug("Starting HTTP analysis")
 
             http_results = [
@@ -129,52 +146,41 @@ class BadDNS_cname(BadDNS_base):
                 self.target_httpmanager.https_allowredirects_results,
                 self.target_httpmanager.https_denyredirects_results,
             ]
-
-            for sig in self.signatures:
-                if sig.signature["mode"] == "http":
-                    log.debug(f"Trying signature {sig.signature['service_name']}")
-                    if len(sig.signature["identifiers"]["cnames"]) > 0:
-                        log.debug(
-                            f"Signature contains cnames [{sig.signature['identifiers']['cnames']}], checking them"
-                        )
-                        if not any(
-                            cname_dict["value"] in self.subject
-                            for cname_dict in sig.signature["identifiers"]["cnames"]
-                        ):
-                            log.debug(f"no match for {sig.signature['identifiers']['cnames']} for in {self.subject}")
-                            continue
-                        log.debug("passed CNAME check")
-
-                    if len(sig.signature["identifiers"]["ips"]) > 0:
-                        log.debug(f"Signature contains ips [{sig.signature['identifiers']['ips']}], checking them")
-                        if not any(
-                            ip_signature in self.cname_dnsmanager.ips
-                            for ip_signature in sig.signature["identifiers"]["ips"]
-                        ):
-                            log.debug(
-                                f"no match for {sig.signature['identifiers']['ips']} for in {self.cname_dnsmanager.ips}"
-                            )
-                            continue
-                        log.debug("passed IPS")
-
+            # this loop runs for every candidate signature, so skip building debug messages entirely when they're off
+            debug = log.isEnabledFor(logging.DEBUG)
+            # signatures with identical matcher rules are only evaluated once against the responses
+            rule_results = {}
+
+            # candidates were already filtered on cname and ip identifiers during dispatch
+            for sig in self.http_candidates:
+                if debug:
+                    log.debug("Trying signature %s", sig.signature["service_name"])
+
+                rule_match = rule_results.get(sig.matcher_rule_key)
+                if rule_match is None:
                     m = Matcher(sig.signature)
-                    log.debug("Checking for HTTP matches")
-                    if any(m.is_match(hr) for hr in http_results if hr is not None):
-                        log.debug(f"CNAME {self.cname_dnsmanager.target} Vulnerable")
-                        log.debug(f"With matcher_rule {sig.signature['matcher_rule']}")
-                        findings.append(
-                            Finding(
-                                {
-                                    "target": self.target_dnsmanager.target,
-                                    "description": f"Dangling CNAME, probable subdomain takeover (HTTP String Match)",
-                                    "confidence": "PROBABLE",
-                                    "signature": sig.signature["service_name"],
-                                    "indicator": sig.summarize_matcher_rule(),
-                                    "trigger": trigger,
-                                    "module": type(self),
-                                }
-                            )
+                    if debug:
+                        log.debug("Checking for HTTP matches")
+                    rule_match = any(m.is_match(hr) for hr in http_results if hr is not None)
+                    rule_results[sig.matcher_rule_key] = rule_match
+                elif debug:
+                    log.debug("Reusing result of an identical matcher rule")
+                if rule_match:
+                    log.debug("CNAME %s Vulnerable", cname_target)
+                    log.debug("With matcher_rule %s", sig.signature["matcher_rule"])
+                    findings.append(
+                        Finding(
+                            {
+                                "target": self.target_dnsmanager.target,
+                                "description": f"Dangling CNAME, probable subdomain takeover (HTTP String Match)",
+                                "confidence": "PROBABLE",
+                                "signature": sig.signature["service_name"],
+                                "indicator": sig.summarize_matcher_rule(),
+                                "trigger": trigger,
+                                "module": type(self),
+                            }
                         )
+                    )
 
         # check whois data for unregistered and expiring domains
         if self.cname_whoismanager.whois_result:
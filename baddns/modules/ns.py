@@ -23,18 +23,18 @@ class BadDNS_ns(BadDNS_base):
         )
 
     async def dispatch(self):
-        # omit everything except CNAME. If there is a CNAME chain, we want to run against the end of it.
-        await self.target_dnsmanager.dispatchDNS(omit_types=[["A", "AAAA", "MX", "NS", "SOA", "TXT", "NSEC"]])
-
-        if self.target_dnsmanager.answers["CNAME"] != None:
-            self.infomsg(
-                f"Detected CNAME(S). Will set target to end of CNAME chain: [{self.target_dnsmanager.answers['CNAME'][-1]}]"
-            )
-            self.target_dnsmanager.target = self.target_dnsmanager.answers["CNAME"][-1]
-            self.target = self.target_dnsmanager.answers["CNAME"][-1]
+        # NS records come from the DnsWalk below, everything else we need is resolved in a single pass
+        await self.target_dnsmanager.dispatchDNS(omit_types=["NS", "NSEC"])
+
+        # If there is a CNAME chain, we want to run against the end of it.
+        cnames = self.target_dnsmanager.answers["CNAME"]
+        if cnames:
+            last_cname = cnames[-1]
+            self.infomsg(f"Detected CNAME(S). Will set target to end of CNAME chain: [{last_cname}]")
+            self.target_dnsmanager.target = last_cname
+            self.target = last_cname
             self.target_dnsmanager.reset_answers()
-
-        await self.target_dnsmanager.dispatchDNS(omit_types=["CNAME", "NS"])
+            await self.target_dnsmanager.dispatchDNS(omit_types=["CNAME", "NS", "NSEC"])
 
         dnswalk = DnsWalk(
             self.target_dnsmanager,
@@ -71,31 +71,31 @@ class BadDNS_ns(BadDNS_base):
             return False
         if self.target_dnsmanager.answers["SOA"] == None:
             log.debug("No SOA record found w/nameservers present")
-            r = None
-            for sig in self.signatures:
-                if sig.signature["mode"] == "dns_nosoa":
-                    sig_nameservers = [ns for ns in sig.signature["identifiers"]["nameservers"]]
-                    r = self.get_substring_matches(target_nameservers, sig_nameservers)
-                    if r:
-                        findings.append(
-                            Finding(
-                                {
-                                    "target": self.target_dnsmanager.target,
-                                    "description": "Dangling NS Records (NS records without SOA) with known impact",
-                                    "confidence": "PROBABLE",
-                                    "signature": sig.signature["service_name"],
-                                    "indicator": f"DnsWalk Analysis with signature match: {r[1]}",
-                                    "trigger": target_nameservers,
-                                    "module": type(self),
-                                }
-                            )
-                        )
-                        log.debug(
-                            f"Found match for for target nameservers {', '.join(target_nameservers)} with signature [{sig.signature['service_name']}]"
-                        )
-                        return findings
+            sig = self.signature_index.nosoa_match(target_nameservers)
+            if sig:
+                r = self.get_substring_matches(target_nameservers, sig.signature["identifiers"]["nameservers"])
+                findings.append(
+                    Finding(
+                        {
+                            "target": self.target_dnsmanager.target,
+                            "description": "Dangling NS Records (NS records without SOA) with known impact",
+                            "confidence": "PROBABLE",
+                            "signature": sig.signature["service_name"],
+                            "indicator": f"DnsWalk Analysis with signature match: {r[1]}",
+                            "trigger": target_nameservers,
+                            "module": type(self),
+                        }
+                    )
+                )
+                log.debug(
+                    "Found match for for target nameservers %s with signature [%s]",
+                    ", ".join(target_nameservers),
+                    sig.signature["service_name"],
+                )
+                return findings
             log.debug(
-                f"No signature found, falling back to report generic dangling NS record for nameservers: [{', '.join(target_nameservers)}]]"
+                "No signature found, falling back to report generic dangling NS record for nameservers: [%s]]",
+                ", ".join(target_nameservers),
             )
             findings.append(
                 Finding(
@@ -31,7 +31,10 @@ class BadDNS_references(BadDNS_base):
             target, dns_client=self.dns_client, custom_nameservers=self.custom_nameservers
         )
         self.target_httpmanager = HttpManager(
-            self.target, http_client_class=self.http_client_class, skip_redirects=True
+            self.target,
+            http_client_class=self.http_client_class,
+            http_client=self.http_client,
+            skip_redirects=True,
         )
         self.cname_findings = None
         self.cname_findings_direct = None
@@ -156,6 +159,7 @@ class BadDNS_references(BadDNS_base):
                     direct_mode=direct_mode,
                     parent_class="references",
                     http_client_class=self.http_client_class,
+                    http_client=self.target_httpmanager.http_client,
                     dns_client=self.dns_client,
                 )
                 if await cname_instance.dispatch():
@@ -21,7 +21,10 @@ class BadDNS_txt(BadDNS_base):
             target, dns_client=self.dns_client, custom_nameservers=self.custom_nameservers
         )
         self.target_httpmanager = HttpManager(
-            self.target, http_client_class=self.http_client_class, skip_redirects=True
+            self.target,
+            http_client_class=self.http_client_class,
+            http_client=self.http_client,
+            skip_redirects=True,
         )
         self.cname_findings = None
         self.cname_findings_direct = None
@@ -59,6 +62,7 @@ class BadDNS_txt(BadDNS_base):
                     direct_mode=True,
                     parent_class="txt",
                     http_client_class=self.http_client_class,
+                    http_client=self.target_httpmanager.http_client,
                     dns_client=self.dns_client,
                 )
                 if await cname_instance_direct.dispatch():
@@ -78,6 +82,7 @@ class BadDNS_txt(BadDNS_base):
                     direct_mode=False,
                     parent_class="txt",
                     http_client_class=self.http_client_class,
+                    http_client=self.target_httpmanager.http_client,
                     dns_client=self.dns_client,
                 )
                 if await cname_instance.dispatch():
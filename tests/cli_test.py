@@ -1,5 +1,6 @@
 import os
 import sys
+import logging
 import dns
 import pytest
 from mock import patch
@@ -8,6 +9,8 @@ SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 sys.path.append(f"{os.path.dirname(SCRIPT_DIR)}")
 
 from baddns import cli
+from baddns.lib.httpmanager import HttpManager
+from .helpers import RecordingCname, assert_shares_http_client
 
 
 def test_cli_validation_target(monkeypatch, capsys):
@@ -107,3 +110,22 @@ def test_cli_direct(monkeypatch, capsys, mocker, httpx_mock, configure_mock_reso
     assert "Direct mode specified. Only the CNAME module is enabled" in captured.err
     assert "Vulnerable!" in captured.out
     assert "AWS Bucket Takeover Detection" in captured.out
+
+
+@pytest.mark.asyncio
+async def test_cli_execute_module_shares_http_client(monkeypatch):
+    # the cli logger is normally set up by _main
+    monkeypatch.setattr(cli, "log", logging.getLogger("baddns"), raising=False)
+    monkeypatch.setattr(RecordingCname, "instances", [])
+
+    async def no_dispatch(self):
+        return False
+
+    monkeypatch.setattr(RecordingCname, "dispatch", no_dispatch)
+
+    http_client = HttpManager.create_http_client()
+    for target in ["bad.dns", "worse.dns"]:
+        await cli.execute_module(RecordingCname, target, None, [], silent=True, http_client=http_client)
+    assert len(RecordingCname.instances) == 2
+    assert_shares_http_client(RecordingCname.instances, http_client)
+    await http_client.aclose()
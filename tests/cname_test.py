@@ -1,9 +1,11 @@
+import copy
 import pytest
 import datetime
 import requests
 from mock import patch
 from baddns.modules.cname import BadDNS_cname
 from baddns.lib.loader import load_signatures
+from baddns.lib.matcher import Matcher
 from .helpers import mock_signature_load
 
 import ssl
@@ -143,6 +145,97 @@ async def test_cname_http_bigcartel_match(fs, mock_dispatch_whois, httpx_mock, c
     assert any(expected == finding.to_dict() for finding in findings)
 
 
+@pytest.mark.asyncio
+@pytest.mark.httpx_mock(assert_all_requests_were_expected=False)
+async def test_cname_http_identical_matcher_rules(
+    fs, mock_dispatch_whois, httpx_mock, configure_mock_resolver, monkeypatch
+):
+    mock_data = {"bad.dns": {"CNAME": ["baddns.bigcartel.com"]}, "baddns.bigcartel.com": {"A": ["127.0.0.1"]}}
+    mock_resolver = configure_mock_resolver(mock_data)
+
+    httpx_mock.add_response(
+        url="http://bad.dns/",
+        status_code=200,
+        text="<h1>Oops! We couldn&#8217;t find that page.</h1>",
+    )
+
+    target = "bad.dns"
+    mock_signature_load(fs, "nucleitemplates_bigcartel-takeover.yml")
+    signatures = load_signatures("/tmp/signatures")
+    duplicate = copy.deepcopy(signatures[0])
+    duplicate.signature["service_name"] = "Bigcartel Duplicate"
+    signatures.append(duplicate)
+
+    match_calls = []
+    original_is_match = Matcher.is_match
+
+    def counting_is_match(self, response):
+        match_calls.append(response)
+        return original_is_match(self, response)
+
+    monkeypatch.setattr(Matcher, "is_match", counting_is_match)
+
+    baddns_cname = BadDNS_cname(target, signatures=signatures, dns_client=mock_resolver)
+    assert await baddns_cname.dispatch()
+    findings = baddns_cname.analyze()
+
+    assert {finding.to_dict()["signature"] for finding in findings} == {
+        "Bigcartel Takeover Detection",
+        "Bigcartel Duplicate",
+    }
+    # the rule matched on the first response, and the duplicate reused that result
+    assert len(match_calls) == 1
+
+
+def test_cname_matcher_rule_not_json_serializable(fs):
+    mock_signature_load(fs, "nucleitemplates_bigcartel-takeover.yml")
+    fs.create_file(
+        "/tmp/signatures/self_dated.yml",
+        contents="""identifiers:
+  cnames:
+  - type: word
+    value: dated.dns
+matcher_rule:
+  matchers:
+  - condition: and
+    part: body
+    type: word
+    words:
+    - 2023-01-01
+  matchers-condition: and
+mode: http
+service_name: Dated Signature
+source: self
+""",
+    )
+    signatures = load_signatures("/tmp/signatures")
+    assert {sig.signature["service_name"] for sig in signatures} == {
+        "Dated Signature",
+        "Bigcartel Takeover Detection",
+    }
+    assert len({sig.matcher_rule_key for sig in signatures}) == 2
+
+
+@pytest.mark.asyncio
+async def test_cname_http_no_candidate_signatures(fs, mock_dispatch_whois, httpx_mock, configure_mock_resolver):
+    mock_data = {
+        "bad.dns": {"CNAME": ["baddns.somerandomthing.com"]},
+        "baddns.somerandomthing.com": {"A": ["127.0.0.1"]},
+    }
+    mock_resolver = configure_mock_resolver(mock_data)
+
+    target = "bad.dns"
+    mock_signature_load(fs, "nucleitemplates_bigcartel-takeover.yml")
+    signatures = load_signatures("/tmp/signatures")
+    baddns_cname = BadDNS_cname(target, signatures=signatures, dns_client=mock_resolver)
+
+    assert await baddns_cname.dispatch()
+    # the cname can't match the bigcartel signature, so no HTTP requests should have been made
+    assert baddns_cname.target_httpmanager == None
+    assert not httpx_mock.get_requests()
+    assert baddns_cname.analyze() == []
+
+
 @pytest.mark.asyncio
 async def test_cname_http_bigcartel_negative(fs, mock_dispatch_whois, httpx_mock, configure_mock_resolver):
     mock_data = {"bad.dns": {"CNAME": ["baddns.bigcartel.com"]}, "_NXDOMAIN": ["baddns.bigcartel.com"]}
@@ -0,0 +1,83 @@
+import asyncio
+import pytest
+
+from baddns.lib.dnsmanager import DNSManager, _GlobalResolver
+from .helpers import MockResolver
+
+
+def test_dnsmanager_shares_default_resolver(monkeypatch):
+    monkeypatch.setattr(_GlobalResolver, "_resolvers", {})
+    monkeypatch.setattr(_GlobalResolver, "_caches", {})
+    assert DNSManager("bad.dns").dns_client is DNSManager("worse.dns").dns_client
+    custom = DNSManager("bad.dns", custom_nameservers=["127.0.0.53"])
+    assert custom.dns_client is not DNSManager("bad.dns").dns_client
+    assert custom.dns_client.nameservers == ["127.0.0.53"]
+    assert custom.dns_client is DNSManager("worse.dns", custom_nameservers=["127.0.0.53"]).dns_client
+
+
+@pytest.mark.asyncio
+async def test_dnsmanager_bounded_concurrency(monkeypatch, configure_mock_resolver):
+    monkeypatch.setattr(_GlobalResolver, "max_concurrent_queries", 2)
+    in_flight = 0
+    max_in_flight = 0
+
+    class SlowResolver(MockResolver):
+        async def resolve(self, query_name, rdtype_obj=None):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return await super().resolve(query_name, rdtype_obj)
+
+    configure_mock_resolver({})
+    slow_resolver = SlowResolver({"bad.dns": {"A": ["127.0.0.1"]}})
+    managers = [DNSManager("bad.dns", dns_client=slow_resolver) for _ in range(3)]
+    await asyncio.gather(*[m.dispatchDNS() for m in managers])
+
+    assert max_in_flight == 2
+    assert all(m.answers["A"] == ["127.0.0.1"] for m in managers)
+
+
+@pytest.mark.asyncio
+async def test_dnsmanager_caches_shared_resolver_answers(monkeypatch, configure_mock_resolver):
+    monkeypatch.setattr(_GlobalResolver, "_resolvers", {})
+    monkeypatch.setattr(_GlobalResolver, "_caches", {})
+    configure_mock_resolver({})
+    mock_resolver = MockResolver({"bad.dns": {"A": ["127.0.0.1"]}, "_NXDOMAIN": ["worse.dns"]})
+    queried = []
+
+    async def counting_resolve(query_name, rdtype_obj=None):
+        queried.append((query_name, rdtype_obj))
+        return await mock_resolver.resolve(query_name, rdtype_obj)
+
+    monkeypatch.setattr(_GlobalResolver.get(), "resolve", counting_resolve)
+
+    for _ in range(2):
+        dnsmanager = DNSManager("bad.dns")
+        await dnsmanager.dispatchDNS(omit_types=["AAAA", "MX", "CNAME", "NS", "SOA", "TXT", "NSEC"])
+        assert dnsmanager.answers["A"] == ["127.0.0.1"]
+
+        dnsmanager = DNSManager("worse.dns")
+        await dnsmanager.dispatchDNS(omit_types=["AAAA", "MX", "CNAME", "NS", "SOA", "TXT", "NSEC"])
+        assert dnsmanager.answers["NXDOMAIN"]
+
+    assert queried == [("bad.dns", "A"), ("worse.dns", "A")]
+
+
+@pytest.mark.asyncio
+async def test_dnsmanager_omit_types(configure_mock_resolver):
+    queried = []
+
+    class RecordingResolver(MockResolver):
+        async def resolve(self, query_name, rdtype_obj=None):
+            queried.append(rdtype_obj)
+            return await super().resolve(query_name, rdtype_obj)
+
+    configure_mock_resolver({})
+    dnsmanager = DNSManager("bad.dns", dns_client=RecordingResolver({}))
+    await dnsmanager.dispatchDNS(omit_types=["A", "AAAA", "MX", "NS", "SOA", "TXT", "NSEC"])
+    assert queried == ["CNAME"]
+
+    with pytest.raises(TypeError):
+        await dnsmanager.dispatchDNS(omit_types=[["A", "AAAA", "MX", "NS", "SOA", "TXT", "NSEC"]])
@@ -2,6 +2,8 @@ import os
 import dns
 from importlib import resources
 
+from baddns.modules.cname import BadDNS_cname
+
 
 def mock_process_answer(self, answer, rdatatype):
     return answer
@@ -15,6 +17,29 @@ class MockDNSWalk:
         self.mock_dnswalk_data
 
 
+class RecordingCname(BadDNS_cname):
+    """
+    BadDNS_cname that records every instance created, so tests can inspect what nested cname checks were handed.
+    Tests should monkeypatch `instances` to a fresh list.
+    """
+
+    instances = []
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        RecordingCname.instances.append(self)
+
+
+def assert_shares_http_client(instances, http_client):
+    assert instances
+    for instance in instances:
+        assert instance.http_client is http_client
+        if instance.target_httpmanager:
+            assert instance.target_httpmanager.http_client is http_client
+            assert instance.target_httpmanager.owns_http_client == False
+    assert not http_client.is_closed
+
+
 class MockResolver:
     def __init__(self, mock_data=None):
         self.mock_data = mock_data if mock_data else {}
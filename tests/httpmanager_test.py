@@ -0,0 +1,47 @@
+import pytest
+
+from baddns.lib.httpmanager import HttpManager
+
+
+@pytest.mark.asyncio
+async def test_httpmanager_redirect_variants_from_one_request(httpx_mock):
+    httpx_mock.add_response(url="http://bad.dns/", status_code=301, headers={"Location": "http://bad.dns/landing"})
+    httpx_mock.add_response(url="http://bad.dns/landing", status_code=200, text="landed")
+    httpx_mock.add_response(url="https://bad.dns/", status_code=200, text="no redirect")
+
+    httpmanager = HttpManager("bad.dns")
+    await httpmanager.dispatchHttp()
+    await httpmanager.close()
+
+    assert httpmanager.http_allowredirects_results.status_code == 200
+    assert httpmanager.http_allowredirects_results.text == "landed"
+    assert httpmanager.http_denyredirects_results.status_code == 301
+    assert httpmanager.https_allowredirects_results is httpmanager.https_denyredirects_results
+    assert httpmanager.https_denyredirects_results.text == "no redirect"
+    assert len(httpx_mock.get_requests()) == 3
+
+
+@pytest.mark.asyncio
+async def test_httpmanager_shared_client_not_closed(httpx_mock):
+    http_client = HttpManager.create_http_client()
+    httpmanager = HttpManager("bad.dns", http_client=http_client)
+    await httpmanager.close()
+    assert not http_client.is_closed
+    await http_client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_httpmanager_shared_client_keeps_no_cookies(httpx_mock):
+    httpx_mock.add_response(
+        url="http://a.example.com/", status_code=200, headers={"Set-Cookie": "session=a; Domain=example.com; Path=/"}
+    )
+    httpx_mock.add_response(url="http://b.example.com/", status_code=200)
+
+    http_client = HttpManager.create_http_client()
+    for target in ["a.example.com", "b.example.com"]:
+        httpmanager = HttpManager(target, http_client=http_client, skip_redirects=True)
+        await httpmanager._dispatch_protocol("http")
+    await http_client.aclose()
+
+    assert "cookie" not in httpx_mock.get_request(url="http://b.example.com/").headers
+    assert len(http_client.cookies) == 0
@@ -63,3 +63,13 @@ async def test_ns_nosoa_generic(fs, configure_mock_resolver):
         "module": "NS",
     }
     assert any(expected == finding.to_dict() for finding in findings)
+
+
+def test_ns_get_substring_matches():
+    nameservers = ["ns1.wordpress.com", "ns2.somerandomthing.com"]
+    matched_nameservers, matched_strings = BadDNS_ns.get_substring_matches(
+        nameservers, ["wordpress.com", "ns1.word", "notpresent.com"]
+    )
+    assert matched_nameservers == ["ns1.wordpress.com"]
+    assert sorted(matched_strings) == ["ns1.word", "wordpress.com"]
+    assert BadDNS_ns.get_substring_matches(nameservers, ["notpresent.com"]) == None
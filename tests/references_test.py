@@ -1,11 +1,13 @@
+import sys
 import pytest
 import requests
 import functools
 from mock import patch
 
 from baddns.modules.references import BadDNS_references
+from baddns.lib.httpmanager import HttpManager
 from baddns.lib.loader import load_signatures
-from .helpers import mock_signature_load
+from .helpers import mock_signature_load, RecordingCname, assert_shares_http_client
 
 requests.adapters.BaseAdapter.send = functools.partialmethod(requests.adapters.BaseAdapter.send, verify=False)
 requests.adapters.HTTPAdapter.send = functools.partialmethod(requests.adapters.HTTPAdapter.send, verify=False)
@@ -300,3 +302,35 @@ async def test_references_direct_cors(fs, httpx_mock, configure_mock_resolver, c
         }
 
         assert any(expected == finding.to_dict() for finding in findings)
+
+
+@pytest.mark.asyncio
+@pytest.mark.httpx_mock(assert_all_requests_were_expected=False)
+async def test_references_shares_http_client(fs, httpx_mock, configure_mock_resolver, cached_suffix_list, monkeypatch):
+    mock_data = {"bad.dns": {"A": ["127.0.0.1"]}, "baddns.bigcartel.com": {"A": ["127.0.0.2"]}}
+    mock_resolver = configure_mock_resolver(mock_data)
+    mock_signature_load(fs, "nucleitemplates_bigcartel-takeover.yml")
+    httpx_mock.add_response(
+        url="http://bad.dns/",
+        status_code=200,
+        text='<html><script src="http://baddns.bigcartel.com/script.js"></script></html>',
+    )
+    httpx_mock.add_response(url="http://baddns.bigcartel.com/", status_code=200, text="not a takeover")
+
+    monkeypatch.setattr(RecordingCname, "instances", [])
+    monkeypatch.setattr(sys.modules["baddns.modules.references"], "BadDNS_cname", RecordingCname)
+
+    signatures = load_signatures("/tmp/signatures")
+    http_client = HttpManager.create_http_client()
+    baddns_references = BadDNS_references(
+        "bad.dns", signatures=signatures, dns_client=mock_resolver, http_client=http_client
+    )
+    assert baddns_references.target_httpmanager.owns_http_client == False
+    await baddns_references.dispatch()
+    await baddns_references.cleanup()
+
+    # direct mode then cname mode; only the direct check resolves and dispatches HTTP
+    assert len(RecordingCname.instances) == 2
+    assert RecordingCname.instances[0].target_httpmanager
+    assert_shares_http_client(RecordingCname.instances, http_client)
+    await http_client.aclose()
@@ -0,0 +1,73 @@
+from baddns.lib.loader import load_signatures
+from baddns.lib.signatureindex import SignatureIndex, SubstringIndex, _alternation
+
+signatures = load_signatures()
+
+
+def test_substringindex_suffixes():
+    index = SubstringIndex([("azurewebsites.net", 1), ("websites.net", 2), ("ns1.", 3)])
+    assert sorted(index.match_suffixes("baddns.azurewebsites.net")) == ["azurewebsites.net", "websites.net"]
+    assert index.match_suffixes("azurewebsites.net.evil") == []
+    assert index.get("ns1.") == [3]
+
+
+def test_signatureindex_cached_per_list():
+    assert SignatureIndex.get(signatures) is SignatureIndex.get(signatures)
+    assert SignatureIndex.get(list(signatures)) is not SignatureIndex.get(signatures)
+
+
+def test_signatureindex_nxdomain_matches_bruteforce():
+    index = SignatureIndex.get(signatures)
+    for target in ["baddns.azurewebsites.net", "foo.cloudapp.azure.com", "bad.s3.amazonaws.com", "nothing.dns"]:
+        expected = []
+        for sig in signatures:
+            if sig.signature["mode"] == "dns_nxdomain":
+                for c in sig.signature["identifiers"]["cnames"]:
+                    if target.endswith(c["value"]):
+                        expected.append((sig, c["value"]))
+                        break
+        assert index.nxdomain_matches(target) == expected
+
+
+def test_signatureindex_nosoa_match_bruteforce():
+    index = SignatureIndex.get(signatures)
+    for nameservers in [
+        ["ns1.wordpress.com"],
+        ["ns-1.awsdns-01.org", "ns2.example.com"],
+        ["ns-123.awsdns-45.com", "ns1.someprovider-dns.example.net"],
+        ["ns1.example.com"],
+        [],
+    ]:
+        expected = None
+        for sig in signatures:
+            if sig.signature["mode"] == "dns_nosoa" and any(
+                s in ns for ns in nameservers for s in sig.signature["identifiers"]["nameservers"]
+            ):
+                expected = sig
+                break
+        assert index.nosoa_match(nameservers) is expected
+
+
+def test_signatureindex_http_candidates_bruteforce():
+    index = SignatureIndex.get(signatures)
+    for subject in [
+        "baddns.bigcartel.com",
+        "foo.azurewebsites.net",
+        "bad.s3.amazonaws.com",
+        "a-fairly-long-cname-target-for-testing.eu-west-1.elb.amazonaws.com",
+        "nothing.dns",
+    ]:
+        expected = [
+            sig
+            for sig in signatures
+            if sig.signature["mode"] == "http" and (not sig.cnames or any(c in subject for c in sig.cnames))
+        ]
+        assert index.http_candidates(subject) == expected
+
+
+def test_alternation_matches_any_contained_pattern():
+    patterns = ["ns1.", "ns1.wordpress.com", "wordpress.com", "ns-1.awsdns", "a.b*c"]
+    regex = _alternation(patterns)
+    for subject in ["ns1.wordpress.com", "ns2.wordpress.co", "ns1", "xns-1.awsdns-01.org", "a.b*c", "abbc", ""]:
+        assert bool(regex.search(subject)) == any(p in subject for p in patterns)
+    assert _alternation([]) is None
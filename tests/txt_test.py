@@ -1,7 +1,9 @@
+import sys
 import pytest
 from baddns.modules.txt import BadDNS_txt
+from baddns.lib.httpmanager import HttpManager
 from baddns.lib.loader import load_signatures
-from .helpers import mock_signature_load
+from .helpers import mock_signature_load, RecordingCname, assert_shares_http_client
 
 
 @pytest.mark.asyncio
@@ -47,3 +49,27 @@ async def test_txt_dontmatchip(fs, mock_dispatch_whois, configure_mock_resolver)
         findings = baddns_txt.analyze()
 
     assert not findings
+
+
+@pytest.mark.asyncio
+@pytest.mark.httpx_mock(assert_all_requests_were_expected=False)
+async def test_txt_shares_http_client(fs, mock_dispatch_whois, httpx_mock, configure_mock_resolver, monkeypatch):
+    mock_data = {"bad.dns": {"TXT": ["baddns.bigcartel.com"]}, "baddns.bigcartel.com": {"A": ["127.0.0.1"]}}
+    mock_resolver = configure_mock_resolver(mock_data)
+    httpx_mock.add_response(url="http://baddns.bigcartel.com/", status_code=200, text="not a takeover")
+
+    monkeypatch.setattr(RecordingCname, "instances", [])
+    monkeypatch.setattr(sys.modules["baddns.modules.txt"], "BadDNS_cname", RecordingCname)
+
+    mock_signature_load(fs, "nucleitemplates_bigcartel-takeover.yml")
+    signatures = load_signatures("/tmp/signatures")
+    http_client = HttpManager.create_http_client()
+    baddns_txt = BadDNS_txt("bad.dns", signatures=signatures, dns_client=mock_resolver, http_client=http_client)
+    await baddns_txt.dispatch()
+    await baddns_txt.cleanup()
+
+    # direct mode then cname mode; only the direct check resolves and dispatches HTTP
+    assert len(RecordingCname.instances) == 2
+    assert RecordingCname.instances[0].target_httpmanager
+    assert_shares_http_client(RecordingCname.instances, http_client)
+    await http_client.aclose()
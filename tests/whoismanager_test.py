@@ -0,0 +1,84 @@
+import pytest
+import whois
+from datetime import datetime, timezone
+from dateutil import parser as date_parser
+
+from baddns.lib import whoismanager
+from baddns.lib.whoismanager import WhoisManager
+
+
+@pytest.mark.asyncio
+async def test_whois_cache_registered_domain(monkeypatch):
+    monkeypatch.setattr(whoismanager, "_WHOIS_CACHE", whoismanager.TTLCache(ttl=60, maxsize=10))
+    queried = []
+
+    def fake_whois(domain, quiet=False):
+        queried.append(domain)
+        return {"domain_name": domain, "expiration_date": None}
+
+    monkeypatch.setattr(whois, "whois", fake_whois)
+
+    first = WhoisManager("one.baddns.com")
+    await first.dispatchWHOIS()
+    second = WhoisManager("two.baddns.com")
+    await second.dispatchWHOIS()
+
+    assert queried == ["baddns.com"]
+    assert second.whois_result is first.whois_result
+    assert second.whois_result["data"]["domain_name"] == "baddns.com"
+
+
+@pytest.mark.asyncio
+async def test_whois_cache_skips_transient_errors(monkeypatch):
+    monkeypatch.setattr(whoismanager, "_WHOIS_CACHE", whoismanager.TTLCache(ttl=60, maxsize=10))
+    queried = []
+
+    def fake_whois(domain, quiet=False):
+        queried.append(domain)
+        raise ConnectionResetError("rate limited")
+
+    monkeypatch.setattr(whois, "whois", fake_whois)
+
+    for _ in range(2):
+        w = WhoisManager("baddns.com")
+        await w.dispatchWHOIS()
+        assert w.whois_result == {"type": "error", "data": "rate limited"}
+
+    assert queried == ["baddns.com", "baddns.com"]
+
+
+@pytest.mark.parametrize(
+    "date_string",
+    [
+        "2023-08-17T14:07:31Z",
+        "2023-08-17T14:07:31.123Z",
+        "2023-08-17T14:07:31+02:00",
+        "2023-08-17 14:07:31",
+        "2023-08-17",
+        "17-aug-2023",
+        "2023.08.17",
+        "2023/08/17",
+        "August 17 2023",
+    ],
+)
+def test_whois_date_parse_matches_dateutil(date_string):
+    assert WhoisManager.date_parse(date_string) == date_parser.parse(date_string)
+
+
+def test_whois_date_parse_invalid():
+    assert WhoisManager.date_parse("not a date") == None
+
+
+@pytest.mark.asyncio
+async def test_whois_expiration_normalized_at_ingestion(monkeypatch):
+    monkeypatch.setattr(whoismanager, "_WHOIS_CACHE", whoismanager.TTLCache(ttl=60, maxsize=10))
+
+    def fake_whois(domain, quiet=False):
+        return {"domain_name": domain, "expiration_date": ["2023-08-17T14:07:31Z", "not a date", "2021-01-01"]}
+
+    monkeypatch.setattr(whois, "whois", fake_whois)
+
+    w = WhoisManager("bad.baddns.com")
+    await w.dispatchWHOIS()
+    assert w.whois_result["data"]["expiration_date"] == datetime(2023, 8, 17, 14, 7, 31, tzinfo=timezone.utc)
+    assert w.analyzeWHOIS() == ["Registration Expired (Expiration: [2023-08-17 14:07:31]"]